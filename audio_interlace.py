@@ -1,11 +1,28 @@
 import os
+import re
 import argparse
 import subprocess
 import json
 import shutil
+import tempfile
+import heapq
 import logging
+from collections import deque
+from decimal import Decimal
+from functools import lru_cache
+import numpy as np
 from tqdm import tqdm
 
+try:
+    import av  # Optional: --pyav analyzes silence in-process instead of via FFmpeg
+except ImportError:
+    av = None
+
+# silencedetect mono-mode report, e.g. "[silencedetect @ 0x...] channel: 1 | silence_start: 1.25"
+_SILENCE_RE = re.compile(
+    rb'channel: (\d+) \| silence_(start|end): (-?[\d.]+(?:e[-+]?\d+)?)'
+)
+
 
 class AudioProcessor:
     """Core audio processing class for channel splitting, silence detection and segment processing"""
@@ -22,6 +39,13 @@ class AudioProcessor:
         'flac_s16': ('s16', 16)      # FLAC compatible 16-bit integer
     }
 
+    PAN_FILTERS = {
+        'left': 'pan=stereo|c0=1*c0|c1=0*c0',   # Keep left, silence right
+        'right': 'pan=stereo|c0=0*c1|c1=1*c1'   # Keep right, silence left
+    }
+
+    ENVELOPE_RATE = 100  # Peak envelope resolution for in-process silence detection (Hz)
+
     def __init__(self, args):
         """Initialize audio processor with configuration parameters
         
@@ -30,13 +54,16 @@ class AudioProcessor:
         """
         self.args = args
         self.logger = self._setup_logger()
-        self.temp_dir = os.path.abspath(args.temp_dir)
-        self.audio_params = self._get_audio_params(args.input)
+        self.temp_dir = None  # Created once the arguments are validated
+        self.source = args.input  # Replaced by a PCM decode for compressed inputs
+        self.spill_dir = None  # Set when a large file doesn't fit in temp_dir
+        self.audio_params = None  # Probed before silence detection
         self.output_format = os.path.splitext(args.output)[1].lower().lstrip('.')
         if self.output_format not in ['wav', 'flac']:
             raise ValueError("Only support WAV/FLAC output formats")
+        if args.pyav and av is None:
+            raise ValueError("--pyav requires PyAV (pip install av)")
         self._prepare_directories()
-        self.logger.info(f"Input audio params: {self.audio_params}")
 
     def _setup_logger(self):
         """Initialize and configure logger instance
@@ -54,250 +81,421 @@ class AudioProcessor:
         return logger
 
     def _prepare_directories(self):
-        """Create temporary directories structure for processing"""
-        os.makedirs(self.temp_dir, exist_ok=True)
-        for channel in ['left', 'right']:
-            os.makedirs(os.path.join(self.temp_dir, channel), exist_ok=True)
+        """Create the temporary directory for processing
+        
+        Without --temp-dir every run gets a private directory, on RAM-backed
+        tmpfs when available, so concurrent runs never clean up each other's
+        files.
+        """
+        if self.args.temp_dir:
+            self.temp_dir = os.path.abspath(self.args.temp_dir)
+            os.makedirs(self.temp_dir, exist_ok=True)
+        else:
+            shm = '/dev/shm'
+            usable = os.path.isdir(shm) and os.access(shm, os.W_OK)
+            self.temp_dir = tempfile.mkdtemp(prefix='audio-interlace-', dir=shm if usable else None)
 
     def process(self):
         """Main processing workflow controller"""
         try:
-            left, right = self._split_channels()
-            left_segments = self._process_channel(left, 'left')
-            right_segments = self._process_channel(right, 'right')
+            self.audio_params = self._get_audio_params(self.args.input)
+            self.logger.info(f"Input audio params: {self.audio_params}")
+            if not self.audio_params['codec_name'].startswith('pcm_'):
+                if self.args.pyav:
+                    self.logger.warning("--pyav only applies to PCM input, detecting silence with FFmpeg")
+                # Decode compressed input once, alongside silence detection, so the
+                # render pass reads PCM instead of running the decoder again
+                self.source = os.path.join(
+                    self._scratch_dir(self._pcm_size(self.audio_params['duration']), "decoding input"),
+                    'source.wav'
+                )
+                left_silences, right_silences = self._detect_silence(decode_to=self.source)
+                self.audio_params = self._get_audio_params(self.source)
+            elif self.args.pyav:
+                left_silences, right_silences = self._detect_silence_in_process()
+            else:
+                left_silences, right_silences = self._detect_silence()
+
+            left_segments = self._process_channel('left', left_silences)
+            right_segments = self._process_channel('right', right_silences)
             self._merge_segments(left_segments, right_segments)
         finally:
             if not self.args.keep_temp:
                 self._cleanup()
+            else:
+                kept = ', '.join(filter(None, [self.temp_dir, self.spill_dir]))
+                self.logger.info(f"Temporary files kept in {kept}")
 
-    def _split_channels(self):
-        """Split stereo input into separate mono channel files
+    def _pcm_size(self, duration):
+        """Estimate the size of the input's audio as uncompressed PCM
+        
+        Args:
+            duration: Audio duration in seconds
         
         Returns:
-            tuple: (left_channel_path, right_channel_path)
+            float: Size in bytes
         """
-        self.logger.info("Splitting stereo channels...")
-        left_path = os.path.join(self.temp_dir, 'left.wav')
-        right_path = os.path.join(self.temp_dir, 'right.wav')
-
-        subprocess.run([
-            'ffmpeg', '-y', '-i', self.args.input,
-            '-filter_complex', 'channelsplit=channel_layout=stereo[left][right]',
-            '-map', '[left]', left_path,
-            '-map', '[right]', right_path,
-            '-loglevel', 'error'
-        ], check=True)
-        return left_path, right_path
-
-    def _process_channel(self, input_file, channel):
-        """Process single audio channel through full pipeline
+        params = self.audio_params
+        bits = self.ENCODER_MAPPING.get(params['sample_fmt'], self.ENCODER_MAPPING['flt'])[1]
+        return duration * params['sample_rate'] * params['channels'] * bits / 8
+
+    def _scratch_dir(self, size, purpose):
+        """Choose a directory with room for a large intermediate file
+        
+        PCM files are as large as the uncompressed audio, easily more than a
+        small tmpfs such as Docker's default 64 MB /dev/shm holds. When the temp
+        directory lacks room, they go to a scratch directory next to the output
+        instead.
         
         Args:
-            input_file: Path to input audio file
-            channel: Channel identifier ('left' or 'right')
+            size: Bytes about to be written
+            purpose: What is being written, for the log message
         
         Returns:
-            list: Processed segment metadata
+            str: Directory to write to
         """
-        self.logger.info(f"Processing {channel} channel...")
-        duration = self._get_duration(input_file)
-        silences = self._detect_silence(input_file)
-        segments = self._calculate_segments(silences, duration)
-        return self._split_and_fade(input_file, segments, channel)
+        if shutil.disk_usage(self.temp_dir).free > size:
+            return self.temp_dir
 
-    def _get_duration(self, input_file):
-        """Get audio duration in seconds using FFprobe
+        if self.spill_dir is None:
+            self.spill_dir = tempfile.mkdtemp(
+                prefix='.audio-interlace-', dir=os.path.dirname(os.path.abspath(self.args.output))
+            )
+        self.logger.info(f"Not enough room in {self.temp_dir}, {purpose} to {self.spill_dir}")
+        return self.spill_dir
+
+    def _run_ffmpeg(self, cmd, capture):
+        """Run an FFmpeg command, collecting the stderr lines matching a pattern
+        
+        stderr is consumed line by line as FFmpeg writes it and only matching
+        lines are kept, so memory stays bounded however long the input is.
         
         Args:
-            input_file: Path to audio file
+            cmd: Full command line
+            capture: Compiled bytes regex to search stderr lines for
         
         Returns:
-            float: Duration in seconds
+            list: Match objects for captured stderr lines
+        
+        Raises:
+            subprocess.CalledProcessError: If FFmpeg exits with an error
         """
-        cmd = [
-            'ffprobe', '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'json', input_file
-        ]
-        result = subprocess.run(cmd, stdout=subprocess.PIPE)
-        return float(json.loads(result.stdout)['format']['duration'])
+        matches = []
+        tail = deque(maxlen=20)  # Last lines, reported if FFmpeg fails
+        with subprocess.Popen(
+            cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+        ) as process:
+            for line in process.stderr:
+                match = capture.search(line)
+                if match:
+                    matches.append(match)
+                else:
+                    tail.append(line)
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=b''.join(tail))
+        return matches
+
+    def _detect_silence(self, decode_to=None):
+        """Detect silence in both channels with a single FFmpeg pass
+        
+        The input is decoded once and fed to silencedetect in mono mode, which
+        checks each channel separately and tags its reports with the channel
+        index. The same pass can also write the decoded audio out as PCM.
+        
+        Args:
+            decode_to: Optional path to write the decoded input to as WAV
+        
+        Returns:
+            tuple: (left_silences, right_silences)
+        """
+        self.logger.info("Detecting silence in both channels...")
+        detect = f'silencedetect=noise={self.args.noise_level}dB:d={self.args.min_silence}:mono=1'
+        filters = [f'[0:a]{detect}[analysis_null]']
+        decode_args = []
+        if decode_to is not None:
+            filters = ['[0:a]asplit=2[decoded][analysis]', f'[analysis]{detect}[analysis_null]']
+            # Formats without a PCM mapping are kept as float
+            encoder = self.ENCODER_MAPPING.get(
+                self.audio_params['sample_fmt'], self.ENCODER_MAPPING['flt']
+            )[0]
+            decode_args = ['-map', '[decoded]', '-c:a', encoder, decode_to]
+
+        # silencedetect reports at info level, so ffmpeg can't run with -loglevel error
+        reports = self._run_ffmpeg([
+            'ffmpeg', '-y', '-hide_banner', '-nostats',
+            '-i', self.args.input,
+            '-filter_complex', ';'.join(filters),
+            *decode_args,
+            '-map', '[analysis_null]', '-f', 'null', '-'
+        ], capture=_SILENCE_RE)
+
+        silences = self._parse_silence(reports, {'left': 0, 'right': 1})
+        return silences['left'], silences['right']
+
+    def _detect_silence_in_process(self):
+        """Detect silence in both channels by decoding the input with PyAV
+        
+        Mirrors silencedetect: a silence is a stretch where every sample stays
+        below the noise level for at least the minimum silence duration.
+        
+        Decoded frames are folded into a peak envelope at ENVELOPE_RATE as they
+        arrive, so memory follows the envelope rather than the decoded audio.
+        A window only counts as silent if all of its samples are below the
+        noise level, which matches silencedetect's per-sample test to within
+        one window.
+        
+        Returns:
+            tuple: (left_silences, right_silences)
+        """
+        self.logger.info("Detecting silence in both channels (in-process)...")
+        with av.open(self.source) as container:
+            stream = container.streams.audio[0]
+            sample_rate = stream.rate
+            hop = max(1, sample_rate // self.ENVELOPE_RATE)
+            # Resample to planar float so every format decodes to (channels, samples)
+            resampler = av.AudioResampler(format='fltp', layout='stereo', rate=sample_rate)
+            peaks = []
+            carry = np.empty((2, 0), dtype=np.float32)  # Samples of an unfinished window
+            total = 0
+            for decoded in container.decode(stream):
+                for frame in resampler.resample(decoded):
+                    samples = np.concatenate((carry, np.abs(frame.to_ndarray())), axis=1)
+                    complete = samples.shape[1] - samples.shape[1] % hop
+                    peaks.append(samples[:, :complete].reshape(2, -1, hop).max(axis=2))
+                    carry = samples[:, complete:]
+                    total += frame.samples
+            if carry.shape[1]:
+                peaks.append(carry.max(axis=1, keepdims=True))
+
+        left, right = np.concatenate(peaks, axis=1) if peaks else np.empty((2, 0))
+        return (
+            self._find_silence_runs(left, hop, total, sample_rate),
+            self._find_silence_runs(right, hop, total, sample_rate)
+        )
 
-    def _detect_silence(self, input_file):
-        """Detect silence intervals using FFmpeg's silencedetect filter
+    def _find_silence_runs(self, envelope, hop, total, sample_rate):
+        """Find stretches of a peak envelope that stay below the noise level
         
         Args:
-            input_file: Path to audio file
+            envelope: Peak absolute sample value per window of hop samples
+            hop: Samples per envelope window
+            total: Total number of samples
+            sample_rate: Samples per second
         
         Returns:
-            list: Silence intervals as (start, end) tuples
+            ndarray: Silence intervals as (start, end) rows in seconds
         """
-        self.logger.info(f"Detecting silence in {os.path.basename(input_file)}...")
-        cmd = [
-            'ffmpeg', '-i', input_file, '-af',
-            f'silencedetect=noise={self.args.noise_level}dB:d={self.args.min_silence}',
-            '-f', 'null', '-'
+        silent = envelope < 10 ** (self.args.noise_level / 20)
+        edges = np.diff(np.concatenate(([0], silent.astype(np.int8), [0])))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1)
+        keep = (ends - starts) >= np.ceil(self.args.min_silence * sample_rate / hop)
+        return np.column_stack((starts[keep] * hop, np.minimum(ends[keep] * hop, total))) / sample_rate
+
+    def _process_channel(self, channel, silences):
+        """Calculate the segments of a single audio channel
+        
+        Args:
+            channel: Channel identifier ('left' or 'right')
+            silences: Silence intervals detected in this channel
+        
+        Returns:
+            list: Segment metadata
+        """
+        self.logger.info(f"Processing {channel} channel...")
+        segments = self._calculate_segments(silences, self.audio_params['duration'])
+        return [
+            {'start': start, 'end': end, 'channel': channel}
+            for start, end in segments
         ]
-        result = subprocess.run(cmd, stderr=subprocess.PIPE, text=True)
-        return self._parse_silence(result.stderr)
 
-    def _parse_silence(self, output):
-        """Parse FFmpeg's silencedetect output into time intervals
+    def _parse_silence(self, reports, channels):
+        """Parse FFmpeg's silencedetect reports into time intervals per channel
+        
+        An end only ever closes the start reported for the same channel; a start
+        left open at EOF (older FFmpeg doesn't report trailing silence ends)
+        ends at infinity and is clipped to the duration later.
         
         Args:
-            output: FFmpeg's stderr output
+            reports: _SILENCE_RE matches from FFmpeg's stderr, in output order
+            channels: Mapping of channel name to input channel index
         
         Returns:
-            list: Silence intervals as (start, end) tuples
+            dict: Silence intervals per channel as (start, end) rows
         """
-        silences = []
-        current_silence = {}
-        for line in output.split('\n'):
-            if 'silence_start' in line:
-                current_silence['start'] = float(line.split('silence_start: ')[1].split()[0])
-            if 'silence_end' in line:
-                current_silence['end'] = float(line.split('silence_end: ')[1].split()[0])
-                silences.append((current_silence['start'], current_silence['end']))
-                current_silence = {}
-        return silences
+        pending = {}
+        silences = {index: [] for index in channels.values()}
+        for match in reports:
+            index, kind, value = match.groups()
+            index = int(index)
+            if kind == b'start':
+                pending[index] = float(value)
+            elif index in pending and index in silences:
+                silences[index].append((pending.pop(index), float(value)))
+
+        for index, start in pending.items():
+            if index in silences:
+                silences[index].append((start, np.inf))
+
+        return {
+            channel: np.array(silences[index], dtype=float).reshape(-1, 2)
+            for channel, index in channels.items()
+        }
 
     def _calculate_segments(self, silences, duration):
         """Calculate valid audio segments between silence intervals
         
         Args:
-            silences: List of silence intervals
+            silences: Silence intervals as (start, end) rows
             duration: Total audio duration
         
         Returns:
             list: Valid audio segments as (start, end) tuples
         """
-        split_points = [(start + end) / 2 for start, end in silences]
-        segments = []
-        prev_point = 0.0
-        
-        for point in split_points:
-            segments.append((prev_point, point))
-            prev_point = point
-        segments.append((prev_point, duration))
-        
-        return self._merge_short_segments(segments)
+        silences = np.clip(np.asarray(silences, dtype=float).reshape(-1, 2), 0.0, duration)
+        split_points = silences.mean(axis=1)
+        boundaries = np.concatenate(([0.0], split_points, [duration]))
+        return self._merge_short_segments(boundaries)
 
-    def _merge_short_segments(self, segments):
+    def _merge_short_segments(self, boundaries):
         """Merge segments shorter than minimum allowed duration
         
+        A segment keeps absorbing its successors while the merged span stays
+        below the minimum, so each merged segment ends right before the first
+        successor that would take it over. That successor is found by binary
+        search instead of stepping through every segment.
+        
         Args:
-            segments: List of audio segments
+            boundaries: Sorted segment boundaries, from 0 to the total duration
         
         Returns:
             list: Merged segments meeting duration requirements
         """
-        merged = []
-        current_start, current_end = segments[0]
-        
-        for seg in segments[1:]:
-            if (seg[1] - current_start) < self.args.min_segment:
-                current_end = seg[1]
-            else:
-                merged.append((current_start, current_end))
-                current_start, current_end = seg
-        merged.append((current_start, current_end))
-        
-        return merged
-
-    def _split_and_fade(self, input_file, segments, channel):
-        """Split audio into segments with crossfade effects
+        min_segment = self.args.min_segment
+        ends = boundaries[1:]
+        last = len(ends)
+        points = [0]
+        current = 0
+
+        while True:
+            start = boundaries[current]
+            following = max(int(np.searchsorted(ends, start + min_segment)), current + 1)
+            # The search compares against a rounded sum; settle ties on the same
+            # end - start subtraction the merge rule is defined by
+            while following > current + 1 and ends[following - 1] - start >= min_segment:
+                following -= 1
+            while following < last and ends[following] - start < min_segment:
+                following += 1
+            current = following
+            if current >= last:
+                break
+            points.append(current)
+        points.append(last)
+        return list(zip(boundaries[points[:-1]].tolist(), boundaries[points[1:]].tolist()))
+
+    def _run_with_progress(self, cmd, desc, total):
+        """Run FFmpeg while reporting its progress through a tqdm bar
         
         Args:
-            input_file: Path to input audio
-            segments: List of segments to process
-            channel: Channel identifier
+            cmd: FFmpeg command without logging/progress options
+            desc: Progress bar description
+            total: Expected output duration in seconds
         
-        Returns:
-            list: Metadata for processed segments
+        Raises:
+            subprocess.CalledProcessError: If FFmpeg exits with an error
         """
-        output_dir = os.path.join(self.temp_dir, channel)
-        fade_duration = self.args.fade / 1000  # Convert ms to seconds
-        outputs = []
-
-        with tqdm(segments, desc=f"Processing {channel} segments") as pbar:
-            for idx, (start, end) in enumerate(pbar):
-                output = self._process_segment(
-                    input_file, output_dir, idx,
-                    start, end, fade_duration, channel
-                )
-                outputs.append({
-                    'start': start,
-                    'end': end,
-                    'path': output,
-                    'channel': channel
-                })
-                pbar.set_postfix({"current": f"{end:.2f}s"})
-        return outputs
-
-    def _get_audio_params(self, input_file):
-        """Extract audio format parameters using FFprobe
+        cmd = [*cmd, '-loglevel', 'error', '-nostats', '-progress', 'pipe:1']
+        total = round(total, 2)
+        # Throttle redraws, ffmpeg reports progress several times a second
+        with tqdm(
+            total=total, desc=desc, unit='s',
+            mininterval=0.5, maxinterval=2.0, smoothing=0
+        ) as pbar:
+            with subprocess.Popen(
+                cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, text=True
+            ) as process:
+                for line in process.stdout:
+                    key, _, value = line.strip().partition('=')
+                    if key == 'out_time_us' and value.isdigit():
+                        current = min(total, round(int(value) / 1e6, 2))
+                        if current > pbar.n:
+                            pbar.update(current - pbar.n)
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(process.returncode, cmd)
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _probe_audio(path, size, mtime):
+        """Probe audio stream parameters and duration with a single FFprobe call
+        
+        Results are cached per file; size and mtime are part of the key so a
+        rewritten file is probed again.
         
         Args:
-            input_file: Path to audio file
+            path: Absolute path to audio file
+            size: File size in bytes
+            mtime: File modification time
         
         Returns:
-            dict: Audio parameters including sample rate, format, etc.
+            dict: Audio parameters including sample rate, format, duration, etc.
         """
         cmd = [
             'ffprobe', '-v', 'error',
             '-select_streams', 'a:0',
-            '-show_entries', 'stream=sample_rate,sample_fmt,channels,bits_per_sample',
-            '-of', 'json', input_file
+            '-show_entries', 'stream=codec_name,sample_rate,sample_fmt,channels,bits_per_sample:format=duration',
+            '-of', 'json', path
         ]
-        result = subprocess.run(cmd, stdout=subprocess.PIPE, check=True)
-        info = json.loads(result.stdout)['streams'][0]
+        result = subprocess.run(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, check=True)
+        probe = json.loads(result.stdout)
+        info = probe['streams'][0]
         
         return {
+            'codec_name': info['codec_name'],
             'sample_rate': int(info['sample_rate']),
             'sample_fmt': info['sample_fmt'],
             'bits_per_sample': int(info.get('bits_per_sample', 16)),
-            'channels': int(info['channels'])
+            'channels': int(info['channels']),
+            'duration': float(probe['format']['duration'])
         }
 
-    def _process_segment(self, input_file, output_dir, idx, start, end, fade_duration, channel):
-        """Process individual audio segment with fade effects
+    def _get_audio_params(self, input_file):
+        """Extract audio format parameters using FFprobe
+        
+        Args:
+            input_file: Path to audio file
+        
+        Returns:
+            dict: Audio parameters including sample rate, format, duration, etc.
+        """
+        stat = os.stat(input_file)
+        # Copy so callers can't alter the cached entry
+        return dict(self._probe_audio(os.path.abspath(input_file), stat.st_size, stat.st_mtime))
+
+    def _get_segment_filter(self, start, end, fade_duration):
+        """Build the filter chain applying fade effects to one cut segment
         
         Args:
-            input_file: Source audio file
-            output_dir: Directory for processed segments
-            idx: Segment index
             start: Segment start time
             end: Segment end time
             fade_duration: Fade duration in seconds
-            channel: Channel identifier
         
         Returns:
-            str: Path to processed segment file
+            str: FFmpeg filter chain for the segment
         """
-        output_file = os.path.abspath(os.path.join(output_dir, f'segment_{idx}.wav'))
         duration = end - start
-        fade_out_start = max(0, duration - fade_duration)
-
-        filters = [
-            f"afade=in:st=0:d={fade_duration}",
-            f"afade=out:st={fade_out_start}:d={fade_duration}",
-            self._get_pan_filter(channel)
-        ]
-        filter_chain = ",".join(filters)
-
-        subprocess.run([
-            'ffmpeg', '-y',
-            '-ss', str(start),
-            '-to', str(end),
-            '-i', input_file,
-            '-filter_complex', filter_chain,
-            '-ac', '2',
-            '-ar', str(self.audio_params['sample_rate']),
-            '-sample_fmt', self.audio_params['sample_fmt'],
-            '-c:a', self._get_encoder(for_final=False),
-            '-loglevel', 'error',
-            output_file
-        ], check=True)
-        return output_file
+        # Segments shorter than two fades get a triangular envelope instead of
+        # overlapping fades attenuating the same samples twice
+        fade = min(fade_duration, duration / 2)
+        fade_out_start = duration - fade
+
+        filters = ["asetpts=PTS-STARTPTS"]
+        # Zero-length fades would still run every sample through afade
+        if fade > 0:
+            filters += [
+                f"afade=in:st=0:d={fade}",
+                f"afade=out:st={fade_out_start}:d={fade}"
+            ]
+        return ",".join(filters)
 
     def _get_encoder(self, for_final=False):
         """Get appropriate audio encoder configuration
@@ -322,7 +520,7 @@ class AudioProcessor:
             return self._get_encoder(for_final=False)
 
     def _get_pan_filter(self, channel):
-        """Generate FFmpeg pan filter for channel isolation
+        """Generate FFmpeg pan filter keeping one input channel on its stereo side
         
         Args:
             channel: Target channel ('left' or 'right')
@@ -330,25 +528,21 @@ class AudioProcessor:
         Returns:
             str: FFmpeg filter configuration
         """
-        return {
-            'left': 'pan=stereo|c0=1*c0|c1=0*c0',
-            'right': 'pan=stereo|c0=0*c0|c1=1*c0'
-        }[channel]
+        return self.PAN_FILTERS[channel]
 
     def _merge_segments(self, left_segments, right_segments):
-        """Merge processed segments into final output
+        """Merge channel segments into final output
         
         Args:
-            left_segments: Processed left channel segments
-            right_segments: Processed right channel segments
+            left_segments: Left channel segments
+            right_segments: Right channel segments
         """
-        all_segments = left_segments + right_segments
-        
-        # Sort by start time, left channel first for same start time
-        sorted_segments = sorted(
-            all_segments,
-            key=lambda x: (x['start'], x['channel'] == 'right')
-        )
+        # Each channel is already in start order, so a linear merge is enough;
+        # merge is stable, keeping the left channel first for same start time
+        sorted_segments = list(heapq.merge(
+            left_segments, right_segments,
+            key=lambda x: x['start']
+        ))
         
         self.logger.info("Final segment order:")
         for seg in sorted_segments:
@@ -356,23 +550,87 @@ class AudioProcessor:
         
         self._generate_final_output(sorted_segments)
 
+    def _cut_point(self, time):
+        """Place a segment boundary on the sample grid
+        
+        FFmpeg truncates time strings to whole microseconds and rounds those
+        to the nearest sample. Doing the same here lets the --keep-temp pass
+        split its files at the exact sample the render cuts at.
+        
+        Args:
+            time: Boundary time in seconds
+        
+        Returns:
+            tuple: (microseconds, sample index)
+        """
+        us = int(Decimal(str(time)) * 1000000)
+        return us, (us * self.audio_params['sample_rate'] + 500000) // 1000000
+
+    def _segment_filters(self, source, channel, segments):
+        """Build filter lines cutting one channel into its faded segments
+        
+        The channel is panned to its stereo side once, then asegment cuts it
+        at the segment starts, handing every frame to exactly one segment.
+        
+        Args:
+            source: Filter pad carrying the input audio
+            channel: Channel identifier ('left' or 'right')
+            segments: The channel's segments in start order
+        
+        Returns:
+            list: Filter lines, segment k ends on pad [{channel}{k}]
+        """
+        fade_duration = self.args.fade / 1000  # Convert ms to seconds
+        labels = ''.join(f'[cut_{channel}{k}]' for k in range(len(segments)))
+        # A channel's segments are contiguous, each split point is a segment start
+        cuts = '|'.join(f'{self._cut_point(seg["start"])[0]}us' for seg in segments[1:])
+        cut = f'asegment=timestamps={cuts}' if cuts else 'anull'
+        filters = [f'{source}{self._get_pan_filter(channel)},{cut}{labels}']
+        for k, seg in enumerate(segments):
+            segment_filter = self._get_segment_filter(seg['start'], seg['end'], fade_duration)
+            filters.append(f'[cut_{channel}{k}]{segment_filter}[{channel}{k}]')
+        return filters
+
     def _generate_final_output(self, sorted_segments):
-        """Generate final output file from sorted segments
+        """Render sorted segments into the final output in a single FFmpeg pass
+        
+        One filter graph cuts each channel into its faded segments and
+        concatenates all segments in timeline order. Segment audio is streamed
+        straight into the encoder instead of going through temp files.
+        
+        Each channel reads its own copy of the input. concat reads its inputs
+        one at a time, so FFmpeg only decodes the channel whose segment is
+        being consumed instead of buffering the other channel in memory.
         
         Args:
             sorted_segments: Chronologically ordered segments
         """
-        concat_list = os.path.join(self.temp_dir, 'concat.txt')
-        
-        with open(concat_list, 'w') as f:
-            for seg in sorted_segments:
-                linux_path = seg['path'].replace('\\', '/')
-                f.write(f"file '{linux_path}'\n")
+        script_path = os.path.join(self.temp_dir, 'filters.txt')
+        # Segments rounding to no samples would repeat an asegment split point
+        sorted_segments = [
+            seg for seg in sorted_segments
+            if self._cut_point(seg['end'])[1] > self._cut_point(seg['start'])[1]
+        ]
+
+        channel_segments = {'left': [], 'right': []}
+        order = []
+        for seg in sorted_segments:
+            segments = channel_segments[seg['channel']]
+            order.append(f"[{seg['channel']}{len(segments)}]")
+            segments.append(seg)
+
+        filters = []
+        for input_idx, (channel, segments) in enumerate(channel_segments.items()):
+            filters += self._segment_filters(f'[{input_idx}:a]', channel, segments)
+        filters.append(''.join(order) + f'concat=n={len(order)}:v=0:a=1[out]')
+
+        # Script file keeps large segment lists clear of command line length limits
+        with open(script_path, 'w') as f:
+            f.write(';\n'.join(filters))
 
         # Configure output parameters based on format
-        output_args = []
+        original_fmt = self.audio_params['sample_fmt']
         if self.output_format == 'flac':
-            original_fmt = self.audio_params['sample_fmt']
             target_fmt = 's32' if original_fmt in ['flt', 'fltp'] else original_fmt
             
             if target_fmt != original_fmt:
@@ -384,25 +642,84 @@ class AudioProcessor:
             ]
         else:
             output_args = [
-                '-sample_fmt', self.audio_params['sample_fmt']
+                '-sample_fmt', original_fmt
             ]
 
-        subprocess.run([
+        self._run_with_progress([
             'ffmpeg', '-y',
-            '-f', 'concat', 
-            '-safe', '0',
-            '-i', concat_list,
+            '-i', self.source,
+            '-i', self.source,
+            '-filter_complex_script', script_path,
+            '-filter_complex_threads', str(os.cpu_count() or 1),
+            '-map', '[out]',
             '-c:a', self._get_encoder(for_final=True),
             '-ar', str(self.audio_params['sample_rate']),
             *output_args,
-            os.path.abspath(self.args.output),
-            '-loglevel', 'error'
-        ], check=True)
+            os.path.abspath(self.args.output)
+        ], "Rendering segments", sum(seg['end'] - seg['start'] for seg in sorted_segments))
+
+        if self.args.keep_temp:
+            self._write_segment_files(channel_segments)
+
+
+    def _write_segment_files(self, channel_segments):
+        """Write every segment to its own WAV for --keep-temp
+        
+        Runs as a separate pass so the render keeps a single output. Each
+        channel is cut and faded as in the render, joined back into one stream
+        and split into files by the segment muxer, so FFmpeg holds one open
+        file per channel however many segments there are.
+        
+        Args:
+            channel_segments: Segments of each channel in start order
+        """
+        script_path = os.path.join(self.temp_dir, 'segments.txt')
+        sample_rate = self.audio_params['sample_rate']
+        duration = max(segments[-1]['end'] for segments in channel_segments.values())
+        # Both channels' files together hold the input's audio twice
+        output_dir = self._scratch_dir(self._pcm_size(2 * duration), "writing segment files")
+
+        filters = ['[0:a]asplit=2[src_left][src_right]']
+        output_args = []
+        for channel, segments in channel_segments.items():
+            filters += self._segment_filters(f'[src_{channel}]', channel, segments)
+            filters.append(
+                ''.join(f'[{channel}{k}]' for k in range(len(segments)))
+                + f'concat=n={len(segments)}:v=0:a=1[{channel}]'
+            )
+            channel_dir = os.path.join(output_dir, channel)
+            os.makedirs(channel_dir, exist_ok=True)
+
+            # asegment hands each file frames ending exactly on the cut, so split
+            # half a sample early to start the next file on its first frame
+            times = ','.join(
+                f'{round((self._cut_point(seg["start"])[1] - 0.5) * 1e6 / sample_rate)}us'
+                for seg in segments[1:]
+            )
+            output_args += [
+                '-map', f'[{channel}]',
+                '-c:a', self._get_encoder(for_final=False),
+                '-f', 'segment', '-segment_format', 'wav', '-reset_timestamps', '1',
+                *(['-segment_times', times] if times else []),
+                os.path.join(channel_dir, 'segment_%d.wav')
+            ]
+
+        with open(script_path, 'w') as f:
+            f.write(';\n'.join(filters))
+
+        self._run_with_progress([
+            'ffmpeg', '-y',
+            '-i', self.source,
+            '-filter_complex_script', script_path,
+            *output_args
+        ], "Writing segment files", duration)
 
     def _cleanup(self):
         """Clean up temporary processing files"""
         self.logger.info("Cleaning temporary files...")
         shutil.rmtree(self.temp_dir)
+        if self.spill_dir is not None:
+            shutil.rmtree(self.spill_dir)
 
 
 def parse_args():
@@ -434,13 +751,18 @@ def parse_args():
         help='Noise threshold for silence detection in dB (default: -30)'
     )
     parser.add_argument(
-        '--temp-dir', default='temp',
-        help='Temporary directory path (default: temp)'
+        '--temp-dir',
+        help='Temporary directory path (default: a new directory in /dev/shm if available, '
+             'else in the system temp directory)'
     )
     parser.add_argument(
         '--keep-temp', action='store_true',
         help='Retain intermediate processing files'
     )
+    parser.add_argument(
+        '--pyav', action='store_true',
+        help='Detect silence in PCM input in-process with PyAV instead of FFmpeg'
+    )
     return parser.parse_args()
 
 
@@ -0,0 +1,104 @@
+import argparse
+import tempfile
+import unittest
+
+import numpy as np
+
+from audio_interlace import AudioProcessor, _SILENCE_RE
+
+
+def make_processor(temp_dir, **overrides):
+    """Build a processor for exercising its pure helpers, no FFmpeg involved"""
+    args = dict(
+        input='in.wav', output='out.wav', temp_dir=temp_dir, keep_temp=False,
+        pyav=False, fade=500, min_segment=1.0, min_silence=0.5, noise_level=-30
+    )
+    args.update(overrides)
+    return AudioProcessor(argparse.Namespace(**args))
+
+
+def reports(*lines):
+    """Match silencedetect stderr lines the way _run_ffmpeg does"""
+    return [
+        _SILENCE_RE.search(f'[silencedetect @ 0x55d0] {line}'.encode())
+        for line in lines
+    ]
+
+
+class AudioProcessorTest(unittest.TestCase):
+    def setUp(self):
+        self._temp = tempfile.TemporaryDirectory()
+        self.processor = make_processor(self._temp.name)
+
+    def tearDown(self):
+        self._temp.cleanup()
+
+    def parse(self, *lines):
+        return self.processor._parse_silence(reports(*lines), {'left': 0, 'right': 1})
+
+    def test_unmatched_start_at_eof_runs_to_duration(self):
+        silences = self.parse('channel: 0 | silence_start: 10.5')
+        np.testing.assert_array_equal(silences['left'], [[10.5, np.inf]])
+        self.assertEqual(
+            self.processor._calculate_segments(silences['left'], 12.0),
+            [(0.0, 11.25), (11.25, 12.0)]
+        )
+
+    def test_end_from_other_channel_is_ignored(self):
+        silences = self.parse(
+            'channel: 0 | silence_start: 1',
+            'channel: 1 | silence_end: 2 | silence_duration: 1',
+            'channel: 0 | silence_end: 3 | silence_duration: 2',
+        )
+        np.testing.assert_array_equal(silences['left'], [[1.0, 3.0]])
+        self.assertEqual(silences['right'].shape, (0, 2))
+
+    def test_negative_start_is_clipped_to_zero(self):
+        silences = self.parse(
+            'channel: 1 | silence_start: -0.0213',
+            'channel: 1 | silence_end: 2.5 | silence_duration: 2.52',
+        )
+        np.testing.assert_array_equal(silences['right'], [[-0.0213, 2.5]])
+        self.assertEqual(
+            self.processor._calculate_segments(silences['right'], 6.0),
+            [(0.0, 1.25), (1.25, 6.0)]
+        )
+
+    def test_merge_settles_float_ties_on_subtraction(self):
+        # 6.1 - 3.1 falls just short of 3.0 although 3.1 + 3.0 == 6.1,
+        # so the span from 3.1 still absorbs the segment ending at 6.1
+        self.processor.args.min_segment = 3.0
+        boundaries = np.array([0.0, 3.1, 4.0, 6.1, 9.0])
+        self.assertEqual(
+            self.processor._merge_short_segments(boundaries),
+            [(0.0, 3.1), (3.1, 6.1), (6.1, 9.0)]
+        )
+
+    def test_merge_stops_before_span_reaches_minimum(self):
+        boundaries = np.array([0.0, 0.4, 0.8, 1.5, 1.7])
+        self.assertEqual(
+            self.processor._merge_short_segments(boundaries),
+            [(0.0, 0.8), (0.8, 1.7)]
+        )
+
+    def test_short_segment_fades_meet_in_the_middle(self):
+        self.assertEqual(
+            self.processor._get_segment_filter(2.0, 2.5, 0.5),
+            'asetpts=PTS-STARTPTS,afade=in:st=0:d=0.25,afade=out:st=0.25:d=0.25'
+        )
+
+    def test_long_segment_keeps_full_fades(self):
+        self.assertEqual(
+            self.processor._get_segment_filter(0.0, 4.0, 0.5),
+            'asetpts=PTS-STARTPTS,afade=in:st=0:d=0.5,afade=out:st=3.5:d=0.5'
+        )
+
+    def test_zero_fade_skips_afade(self):
+        self.assertEqual(
+            self.processor._get_segment_filter(0.0, 4.0, 0.0),
+            'asetpts=PTS-STARTPTS'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()